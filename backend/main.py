@@ -1,9 +1,73 @@
-from fastapi import APIRouter, FastAPI
+import time
+
+# Taken before the remaining imports so startup timings include import cost
+STARTED_AT = time.perf_counter()
+
+import asyncio
+import traceback
+from contextlib import asynccontextmanager
+
+from fastapi import APIRouter, FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from src import database
 from src.config import settings
 from src.routes import images, users
+from src.warmup import run_warmup
+
+PING_RETRY_MAX_DELAY = 30
+
+
+async def warmup(app: FastAPI):
+    if settings.warmup:
+        try:
+            app.state.warmup_time = await asyncio.to_thread(run_warmup)
+        except Exception:
+            # The warmup is optional, requests are served without it
+            print(traceback.format_exc())
+
+    # Opens the first pooled connection so the first query skips the handshake,
+    # retrying until the database is reachable
+    delay = 1
+    while True:
+        try:
+            await database.get_client().admin.command("ping")
+            break
+        except Exception:
+            print(traceback.format_exc())
+            app.state.error = "database unavailable"
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, PING_RETRY_MAX_DELAY)
+
+    app.state.error = None
+    app.state.ready = True
+    app.state.ready_time = time.perf_counter() - STARTED_AT
+    print(f"Ready after {app.state.ready_time:.3f}s")
+
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.ready = False
+    app.state.error = None
+    app.state.warmup_time = None
+    app.state.ready_time = None
+
+    # Validates substrates.json so a malformed file still fails startup
+    settings.substrates
+
+    database.connect()
+    warmup_task = asyncio.create_task(warmup(app))
+
+    app.state.startup_time = time.perf_counter() - STARTED_AT
+    print(f"Startup finished in {app.state.startup_time:.3f}s")
+
+    yield
+
+    warmup_task.cancel()
+    database.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 prod_cors_origins = [
     "https://bio-hue.vercel.app",
@@ -30,7 +94,7 @@ api_router.include_router(images.router, tags=["Images"])
 
 @api_router.get("/substrates")
 async def list_substrates():
-    return list(images.SUBSTRATES_CONFIG.keys())
+    return list(settings.substrates.keys())
 
 
 app.include_router(api_router)
@@ -44,3 +108,22 @@ async def root():
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready(request: Request):
+    state = request.app.state
+    return JSONResponse(
+        status_code=(
+            status.HTTP_200_OK if state.ready else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+        content={
+            "status": (
+                "ready" if state.ready else "failed" if state.error else "warming up"
+            ),
+            "error": state.error,
+            "startup_time": state.startup_time,
+            "warmup_time": state.warmup_time,
+            "ready_time": state.ready_time,
+        },
+    )
@@ -1,5 +1,6 @@
 import json
 import os
+from functools import cached_property
 from typing import Dict
 
 from pydantic import BaseModel, Field
@@ -28,7 +29,20 @@ class Settings(BaseSettings):
     mongo_uri: str = Field(..., env="MONGO_URI")
     SECRET_KEY: str = Field(..., env="SECRET_KEY")
     database_name: str = Field("biohue", env="DATABASE_NAME")
-    substrates: Dict[str, SubstrateConfig]
+    mongo_max_pool_size: int = Field(100, env="MONGO_MAX_POOL_SIZE")
+    mongo_min_pool_size: int = Field(0, env="MONGO_MIN_POOL_SIZE")
+    mongo_connect_timeout_ms: int = Field(20000, env="MONGO_CONNECT_TIMEOUT_MS")
+    mongo_server_selection_timeout_ms: int = Field(
+        30000, env="MONGO_SERVER_SELECTION_TIMEOUT_MS"
+    )
+    warmup: bool = Field(True, env="WARMUP")
+
+    @cached_property
+    def substrates(self) -> Dict[str, SubstrateConfig]:
+        # Loaded on first access so importing the config stays cheap
+        return load_substrate_config(
+            os.path.join(os.path.dirname(__file__), "substrates.json")
+        )
 
     class Config:
         env_file = ".env"
@@ -40,8 +54,4 @@ def load_substrate_config(file_path: str) -> Dict[str, SubstrateConfig]:
     return {k: SubstrateConfig(**v) for k, v in data.items()}
 
 
-settings = Settings(
-    substrates=load_substrate_config(
-        os.path.join(os.path.dirname(__file__), "substrates.json")
-    )
-)
+settings = Settings()
@@ -3,19 +3,54 @@ from typing import Optional
 
 import pytz
 from bson import ObjectId
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+from motor.motor_asyncio import (
+    AsyncIOMotorClient,
+    AsyncIOMotorCollection,
+    AsyncIOMotorGridFSBucket,
+)
 from pydantic import BaseModel, Field
 from src.config import settings as config
 
-client = AsyncIOMotorClient(config.mongo_uri)
-db = client[config.database_name]
+client: Optional[AsyncIOMotorClient] = None
+fs: Optional[AsyncIOMotorGridFSBucket] = None
 
 
-fs = AsyncIOMotorGridFSBucket(db)
+def connect() -> AsyncIOMotorClient:
+    global client, fs
+    if client is None:
+        client = AsyncIOMotorClient(
+            config.mongo_uri,
+            maxPoolSize=config.mongo_max_pool_size,
+            minPoolSize=config.mongo_min_pool_size,
+            connectTimeoutMS=config.mongo_connect_timeout_ms,
+            serverSelectionTimeoutMS=config.mongo_server_selection_timeout_ms,
+        )
+        fs = AsyncIOMotorGridFSBucket(client[config.database_name])
+    return client
 
-users_collection = db["users"]
-sessions_collection = db["sessions"]
-images_collection = db["images"]
+
+def close():
+    global client, fs
+    if client is not None:
+        client.close()
+    client = None
+    fs = None
+
+
+def get_client() -> AsyncIOMotorClient:
+    if client is None:
+        raise RuntimeError("Database is not connected")
+    return client
+
+
+def get_collection(name: str) -> AsyncIOMotorCollection:
+    return get_client()[config.database_name][name]
+
+
+def get_fs() -> AsyncIOMotorGridFSBucket:
+    if fs is None:
+        raise RuntimeError("Database is not connected")
+    return fs
 
 
 class User(BaseModel):
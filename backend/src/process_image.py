@@ -35,7 +35,7 @@ def extract_prominent_region(
 
     img = cv2.imdecode(np.frombuffer(image, np.uint8), cv2.IMREAD_COLOR)
     if img is None:
-        return None, None
+        return None
 
     h, w, _ = img.shape
 
@@ -85,14 +85,14 @@ def extract_prominent_region(
     contours_info = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
     contours = contours_info[0] if len(contours_info) == 2 else contours_info[1]
     if not contours:
-        return None, None
+        return None
 
     # Select the largest contour
     largest_contour = max(contours, key=cv2.contourArea)
     contour_area = cv2.contourArea(largest_contour)
     image_area = h * w
     if contour_area < min_area_ratio * image_area:
-        return None, None
+        return None
 
     # Create an alpha mask for the largest contour and add it to the image.
     mask_colored = np.zeros((h, w), dtype=np.uint8)
@@ -1,22 +1,20 @@
+import asyncio
 import base64
 import hashlib
+import importlib
 import io
 import traceback
 from typing import List
 
-import cv2
 from bson import ObjectId
 from fastapi import APIRouter, Depends, Form, HTTPException, UploadFile, status
 from fastapi.responses import JSONResponse, Response
 from src.config import settings
-from src.database import Analysis, File, Image, User, fs, images_collection
-from src.process_image import classify_result, compute_metric, extract_prominent_region
+from src.database import Analysis, File, Image, User, get_collection, get_fs
 from src.routes.users import get_current_user
 
 router = APIRouter(prefix="/images")
 
-SUBSTRATES_CONFIG = settings.substrates
-
 
 @router.post("")
 async def upload_image(
@@ -24,8 +22,15 @@ async def upload_image(
     substrate: str = Form(...),
     user: User = Depends(get_current_user),
 ):
+    # Imported here to keep OpenCV and NumPy out of the application's cold start,
+    # in a thread so the event loop isn't blocked while the warmup loads them
+    cv2 = await asyncio.to_thread(importlib.import_module, "cv2")
+    process_image = await asyncio.to_thread(
+        importlib.import_module, "src.process_image"
+    )
+
     try:
-        if substrate not in SUBSTRATES_CONFIG:
+        if substrate not in settings.substrates:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid substrate",
@@ -34,7 +39,7 @@ async def upload_image(
         contents = await image.read()
 
         md5_hash = hashlib.md5(contents).hexdigest()
-        existing_image = await images_collection.find_one(
+        existing_image = await get_collection("images").find_one(
             {
                 "md5_hash": md5_hash,
                 "user_id": user.id,
@@ -50,7 +55,7 @@ async def upload_image(
                 },
             )
 
-        region = extract_prominent_region(contents)
+        region = process_image.extract_prominent_region(contents)
         if region is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -58,15 +63,19 @@ async def upload_image(
             )
 
         try:
-            value = compute_metric(region, SUBSTRATES_CONFIG[substrate].expression)
-            result = classify_result(value, SUBSTRATES_CONFIG[substrate].thresholds)
+            value = process_image.compute_metric(
+                region, settings.substrates[substrate].expression
+            )
+            result = process_image.classify_result(
+                value, settings.substrates[substrate].thresholds
+            )
         except Exception as e:
             raise Exception(f"Error in substrate's configuration: {str(e)}")
 
         _, region_buffer = cv2.imencode(".png", region)
 
-        original_image_id = await fs.upload_from_stream(image.filename, contents)
-        processed_image_id = await fs.upload_from_stream(
+        original_image_id = await get_fs().upload_from_stream(image.filename, contents)
+        processed_image_id = await get_fs().upload_from_stream(
             f"processed_{image.filename}", region_buffer.tobytes()
         )
 
@@ -74,7 +83,7 @@ async def upload_image(
             substrate=substrate,
             value=value,
             result=result,
-            metric=SUBSTRATES_CONFIG[substrate].metric,
+            metric=settings.substrates[substrate].metric,
         )
 
         image_data = Image(
@@ -85,7 +94,7 @@ async def upload_image(
             analysis=analysis,
         )
 
-        await images_collection.insert_one(
+        await get_collection("images").insert_one(
             image_data.model_dump(
                 by_alias=True,
                 exclude_none=True,
@@ -112,21 +121,23 @@ async def upload_image(
 
 @router.get("")
 async def get_images(user: User = Depends(get_current_user)):
-    images = await images_collection.find({"user_id": user.id}).to_list(None)
+    images = await get_collection("images").find({"user_id": user.id}).to_list(None)
 
     images_with_data: List[Image] = []
     for _image in images:
         image = Image(**_image)
 
         original_image = io.BytesIO()
-        await fs.download_to_stream(ObjectId(image.original_image.id), original_image)
+        await get_fs().download_to_stream(
+            ObjectId(image.original_image.id), original_image
+        )
         image.original_image.base64 = base64.b64encode(
             original_image.getvalue()
         ).decode()
 
         if image.processed_image:
             processed_image = io.BytesIO()
-            await fs.download_to_stream(
+            await get_fs().download_to_stream(
                 ObjectId(image.processed_image.id), processed_image
             )
             image.processed_image.base64 = base64.b64encode(
@@ -147,7 +158,7 @@ async def get_images(user: User = Depends(get_current_user)):
 
 @router.delete("/{image_id}")
 async def delete_image(image_id: str, user: User = Depends(get_current_user)):
-    image = await images_collection.find_one({"_id": image_id})
+    image = await get_collection("images").find_one({"_id": image_id})
     if not image:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -161,9 +172,9 @@ async def delete_image(image_id: str, user: User = Depends(get_current_user)):
         )
 
     image = Image(**image)
-    await images_collection.delete_one({"_id": image_id})
-    await fs.delete(ObjectId(image.original_image.id))
+    await get_collection("images").delete_one({"_id": image_id})
+    await get_fs().delete(ObjectId(image.original_image.id))
     if image.processed_image:
-        await fs.delete(ObjectId(image.processed_image.id))
+        await get_fs().delete(ObjectId(image.processed_image.id))
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,21 +1,29 @@
+import asyncio
 import json
+from functools import cache
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from itsdangerous import BadSignature, TimestampSigner
-from passlib.context import CryptContext
 from src.config import settings
-from src.database import Session, User, sessions_collection, users_collection
+from src.database import Session, User, get_collection
 
 SECRET_KEY = settings.SECRET_KEY
 SESSION_COOKIE_NAME = "session"
 
 router = APIRouter(prefix="/users")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 signer = TimestampSigner(SECRET_KEY)
 
 
+@cache
+def get_pwd_context():
+    # passlib and bcrypt are imported on first use to keep the cold start fast
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
 def JSONResponseWithCookie(session: Session, *args, **kwargs):
     response = JSONResponse(*args, **kwargs)
 
@@ -44,7 +52,7 @@ async def get_current_user(request: Request):
     except (BadSignature, json.JSONDecodeError):
         raise HTTPException(status_code=401, detail="Invalid session data")
 
-    db_session = await sessions_collection.find_one(
+    db_session = await get_collection("sessions").find_one(
         {
             "_id": session.id,
             "username": session.username,
@@ -53,7 +61,7 @@ async def get_current_user(request: Request):
     if not db_session:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    user = await users_collection.find_one({"username": session.username})
+    user = await get_collection("users").find_one({"username": session.username})
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
@@ -62,7 +70,7 @@ async def get_current_user(request: Request):
 
 @router.post("/register")
 async def register(user: User):
-    existing_user = await users_collection.find_one({"username": user.username})
+    existing_user = await get_collection("users").find_one({"username": user.username})
     if existing_user:
         return JSONResponse(
             content={"detail": "User already exists"},
@@ -70,12 +78,13 @@ async def register(user: User):
             headers={"WWW-Authenticate": "Bearer realm='Login required'"},
         )
 
+    pwd_context = await asyncio.to_thread(get_pwd_context)
     hashed_password = pwd_context.hash(user.password)
     user.password = hashed_password
-    await users_collection.insert_one(user.model_dump(by_alias=True))
+    await get_collection("users").insert_one(user.model_dump(by_alias=True))
 
     session = Session(username=user.username)
-    await sessions_collection.insert_one(session.model_dump(by_alias=True))
+    await get_collection("sessions").insert_one(session.model_dump(by_alias=True))
 
     return JSONResponseWithCookie(
         session,
@@ -86,13 +95,14 @@ async def register(user: User):
 
 @router.post("/login")
 async def login(user: User):
-    db_user = await users_collection.find_one({"username": user.username})
+    db_user = await get_collection("users").find_one({"username": user.username})
     if not db_user:
         return JSONResponse(
             content={"detail": "User not found"},
             status_code=status.HTTP_401_UNAUTHORIZED,
             headers={"WWW-Authenticate": "Bearer realm='Login required'"},
         )
+    pwd_context = await asyncio.to_thread(get_pwd_context)
     if not pwd_context.verify(user.password, db_user["password"]):
         return JSONResponse(
             content={"detail": "Invalid password"},
@@ -101,8 +111,8 @@ async def login(user: User):
         )
 
     session = Session(username=user.username)
-    await sessions_collection.delete_many({"username": user.username})
-    await sessions_collection.insert_one(session.model_dump(by_alias=True))
+    await get_collection("sessions").delete_many({"username": user.username})
+    await get_collection("sessions").insert_one(session.model_dump(by_alias=True))
 
     return JSONResponseWithCookie(
         session,
@@ -117,7 +127,7 @@ async def me(user: User = Depends(get_current_user)):
 
 @router.post("/logout")
 async def logout(request: Request, user: User = Depends(get_current_user)):
-    await sessions_collection.delete_many({"username": user.username})
+    await get_collection("sessions").delete_many({"username": user.username})
     response = JSONResponse(content={"message": "Logged out"})
     response.delete_cookie(SESSION_COOKIE_NAME)
     return response